@@ -1,8 +1,8 @@
-from time import sleep
-
+import atexit
 from threading import Event
 
 from base.agent.execution.execution import Execution
+from base.agent.handshake import Handshake
 from base.agent.perception.perception import Perception
 from base.agent.thinking.thinking import Thinking
 from base.agent.udpclient import UDPClient
@@ -10,12 +10,19 @@ from base.agent.udpclient import UDPClient
 
 class Agent(UDPClient):
     def __init__(self, team, goalie=False,
-                 perceprion=None, thinking=None, execution=None):
+                 perceprion=None, thinking=None, execution=None, uniform_number=None):
         UDPClient.__init__(self)
 
         self.team = team
         self.goalie = goalie
 
+        # filled in by the server's reply to init/reconnect.  a uniform number
+        # given up front means we reconnect as that player.
+        self.uniform_number = uniform_number
+        self.side = None
+        self.play_mode = None
+        self.version = None
+
         self.perception = perceprion
         self.thinking = thinking
         self.execution = execution
@@ -26,6 +33,10 @@ class Agent(UDPClient):
         self.see_event = Event()
 
     def run(self):
+        if self.recorder is not None:
+            self.recorder.start()
+            atexit.register(self.recorder.close)
+
         self._init_server()
 
         self.execution.start()
@@ -36,16 +47,25 @@ class Agent(UDPClient):
         self.execution.add_command(command)
 
     def _init_server(self):
-        self.sendto(f'(init {self.team})', self.server_addr)
-        msg, self.server_addr = self.recvfrom()
-        print(msg)
-        sleep(1)
+        handshake = Handshake(self)
 
+        if self.uniform_number is None:
+            self.version, (self.side, self.uniform_number, self.play_mode) = handshake.init()
+        else:
+            self.side, self.play_mode = handshake.reconnect(self.uniform_number)
 
-if __name__ == '__main__':
-    agent = Agent('LETIgers')
+        # no need to wait for the parameter burst that follows, perception is
+        # started right away and consumes it.
+
+
+def create_agent(team, goalie=False):
+    agent = Agent(team, goalie)
     agent.perception = Perception(agent)
     agent.thinking = Thinking(agent)
     agent.execution = Execution(agent)
 
-    agent.run()
+    return agent
+
+
+if __name__ == '__main__':
+    create_agent('LETIgers').run()
@@ -5,12 +5,18 @@ from base.agent.execution.commands import Command
 
 
 class Execution(Thread):
+    # time between sense_body and sending the commands collected meanwhile,
+    # for the server's default 100 ms cycle.
+    SEND_DELAY = 0.08
+
     def __init__(self, agent):
         Thread.__init__(self)
 
         self.agent = agent
         self.commands = []
 
+        self.send_delay = self.SEND_DELAY
+
     def add_command(self, command: Command):
         self.commands.append(command)
 
@@ -18,7 +24,10 @@ class Execution(Thread):
         while True:
             self.agent.sense_body_event.clear()
             self.agent.sense_body_event.wait()
-            self.commands = []
-            sleep(0.08)
-            self.agent.sendto(' '.join(map(str, self.commands)), self.agent.server_addr)
+            sleep(self.send_delay)
+
+            # take the commands only when sending, thinking wakes on the same
+            # sense_body and may already have added this cycle's ones.
+            commands, self.commands = self.commands, []
+            self.agent.sendto(' '.join(map(str, commands)), self.agent.server_addr)
             # print('EXECUTION:', ' '.join(map(str, self.commands)))
@@ -0,0 +1,147 @@
+import socket
+from threading import Thread
+from time import monotonic
+
+from base.agent.perception.message_parser import MessageParser
+
+
+class HandshakeError(Exception):
+    """
+    Raised when the server refuses a player or never answers.
+    """
+
+
+class Handshake:
+    """
+    Connects a player to the server with (init ...) or (reconnect ...).
+
+    Every request is retried with an exponentially growing timeout, so a
+    server that is still starting up or a lost datagram does not hang the
+    player.  Protocol versions are tried from the newest one down until the
+    server accepts one.
+
+    The server registers a player for every init it receives, so a retry
+    after a reply that was only slow takes a second slot.  The first timeout
+    is long enough for a loaded host, and the late reply is released with
+    (bye) by perception, see Perception.run.
+    """
+
+    VERSIONS = (19, 15, 7)
+
+    # errors that no other protocol version would fix
+    FATAL_ERRORS = ('no_more_team_or_player_or_goalie', 'no_more_team_or_player',
+                    'reconnect')
+
+    # the server's answer to a protocol version it does not support
+    VERSION_ERROR = 'illegal_client_version'
+
+    def __init__(self, agent, versions=VERSIONS, timeout=1.0, retries=5, backoff=2.0):
+        self.agent = agent
+        self.versions = versions
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+
+        self.parser = MessageParser()
+
+    def init(self):
+        """
+        Registers a new player.  Returns the negotiated version and the
+        (side, uniform_number, play_mode) reply.
+        """
+
+        goalie = ' (goalie)' if self.agent.goalie else ''
+
+        for version in self.versions:
+            for attempt in range(self.retries):
+                msg_type, _, data = self._request(
+                    f'(init {self.agent.team} (version {version}){goalie})', ('init', 'error'))
+
+                if msg_type == 'init':
+                    return version, data
+                if data == self.VERSION_ERROR:
+                    break
+                if data in self.FATAL_ERRORS:
+                    raise HandshakeError(f'init refused: {data}')
+
+                # any other error says nothing about the version and means we
+                # were not registered, so ask again with the same one.
+            else:
+                raise HandshakeError(f'no usable answer to init with version {version}')
+
+        raise HandshakeError(f'server accepted none of the versions {self.versions}')
+
+    def reconnect(self, uniform_number):
+        """
+        Takes over an existing player.  Returns the (side, play_mode) reply.
+        """
+
+        msg_type, _, data = self._request(
+            f'(reconnect {self.agent.team} {uniform_number})', ('reconnect', 'error'))
+
+        if msg_type != 'reconnect':
+            raise HandshakeError(f'reconnect refused: {data}')
+
+        return data
+
+    def _request(self, message, replies):
+        """
+        Sends message until one of the given reply types arrives.  Anything
+        else, ex: a stray datagram, is skipped without sending again.
+        """
+
+        # the server answers from the player's own port, every later message
+        # has to go there instead of the well-known one.
+        timeout = self.timeout
+        sock = self.agent.sock
+
+        try:
+            for attempt in range(self.retries):
+                self.agent.sendto(message, self.agent.server_addr)
+                deadline = monotonic() + timeout
+
+                while monotonic() < deadline:
+                    sock.settimeout(deadline - monotonic())
+                    try:
+                        msg, addr = self.agent.recvfrom()
+                    except (socket.timeout, ConnectionRefusedError):
+                        break
+
+                    try:
+                        msg_type, msg_time, data = self.parser.parse(msg)
+                    except (ValueError, IndexError):
+                        continue
+
+                    if msg_type in replies:
+                        if msg_type in ('init', 'reconnect'):
+                            self.agent.server_addr = addr
+                        return msg_type, msg_time, data
+
+                timeout *= self.backoff
+        finally:
+            sock.settimeout(None)
+
+        raise HandshakeError(f'no answer to {message} after {self.retries} attempts')
+
+
+def start_team(agents):
+    """
+    Runs all the agents' handshakes concurrently, so a team comes up in about
+    the time of a single round trip instead of one after another.
+    """
+
+    errors = []
+
+    def run(agent):
+        try:
+            agent.run()
+        except HandshakeError as e:
+            errors.append((agent, e))
+
+    threads = [Thread(target=run, args=(agent,)) for agent in agents]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return errors
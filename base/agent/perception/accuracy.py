@@ -0,0 +1,71 @@
+from math import atan2, degrees, hypot
+
+from base.soccer.full_state import FullState
+from base.soccer.geometry import normalize_angle
+
+
+class AccuracyReport:
+    """
+    Compares what a see message told us against the full state of the same
+    cycle.  Since see only carries distances and directions relative to the
+    player's head, those are what gets compared.
+    """
+
+    def __init__(self, team):
+        self.team = team
+
+        # object class -> list of (distance error, direction error)
+        self.errors = {'ball': [], 'teammate': [], 'opponent': []}
+
+    def add(self, full_state: FullState, side, uniform_number, objects):
+        me = FullState.slot(side, uniform_number)
+        if full_state.x[me] is None:
+            return
+
+        x, y = full_state.x[me], full_state.y[me]
+        face = full_state.body[me] + full_state.neck[me]
+
+        ball, players, flags, lines, goals = objects
+
+        if ball is not None and ball.distance is not None and full_state.ball is not None:
+            self._compare('ball', ball, x, y, face, full_state.ball[0], full_state.ball[1])
+
+        other_side = 'r' if side == 'l' else 'l'
+        for player in players:
+            if player.uniform_number is None or player.distance is None:
+                continue
+
+            if player.team == self.team:
+                kind, player_side = 'teammate', side
+            else:
+                kind, player_side = 'opponent', other_side
+
+            i = FullState.slot(player_side, player.uniform_number)
+            if full_state.x[i] is not None:
+                self._compare(kind, player, x, y, face, full_state.x[i], full_state.y[i])
+
+    def _compare(self, kind, obj, x, y, face, true_x, true_y):
+        distance = hypot(true_x - x, true_y - y)
+        direction = degrees(atan2(true_y - y, true_x - x)) - face
+
+        dir_error = normalize_angle(obj.direction - direction)
+
+        self.errors[kind].append((obj.distance - distance, dir_error))
+
+    def summary(self):
+        lines = ['%-9s %6s %10s %10s %10s %10s' % ('object', 'count', 'dist mean', 'dist max',
+                                                  'dir mean', 'dir max')]
+
+        for kind, errors in self.errors.items():
+            if not errors:
+                lines.append('%-9s %6d' % (kind, 0))
+                continue
+
+            dist = [abs(e[0]) for e in errors]
+            dirs = [abs(e[1]) for e in errors]
+            lines.append('%-9s %6d %10.3f %10.3f %10.2f %10.2f' % (
+                kind, len(errors),
+                sum(dist) / len(dist), max(dist),
+                sum(dirs) / len(dirs), max(dirs)))
+
+        return '\n'.join(lines)
@@ -1,4 +1,5 @@
 import re
+from base.soccer.full_state import *
 from base.soccer.objects import *
 from base.soccer.sense_body import *
 
@@ -7,7 +8,16 @@ class MessageParser:
     PATTERN_INT = re.compile("^-?\d+$")
     PATTERN_FLOAT = re.compile("^-?\d*[.]\d+$")
 
+    PATTERN_FULLSTATE_PMODE = re.compile(r"\(pmode (\w+)\)")
+    PATTERN_FULLSTATE_SCORE = re.compile(r"\(score (\d+) (\d+)\)")
+    PATTERN_FULLSTATE_OBJECT = re.compile(r"\(\((b|p ([lr]) (\d+)( g)?[^)]*)\) ([-\d.e ]+)")
+
     def parse(self, msg):
+        # fullstate messages are big and arrive every cycle, they skip the
+        # generic parser and are scanned with regular expressions instead.
+        if msg.startswith("(fullstate "):
+            return self._parse_fullstate(msg)
+
         # get all the expressions contained in the given message
         linked = self._link_text(msg)
 
@@ -269,6 +279,7 @@ class MessageParser:
         speed_amount = None
         speed_direction = None
         neck_direction = None
+        turn_count = None
 
         for info in msg[2:]:
             name = info[0]
@@ -286,13 +297,83 @@ class MessageParser:
                     speed_direction = values[1]
             elif name == "head_angle":
                 neck_direction = values[0]
+            elif name == "turn":
+                turn_count = values[0]
             else:
                 pass
 
         return msg[0], msg[1], SenseBody(view_quality, view_width,
                                          stamina, effort,
                                          speed_amount, speed_direction,
-                                         neck_direction)
+                                         neck_direction, turn_count)
+
+    def _parse_fullstate(self, msg):
+        """
+        Reads the exact positions and velocities of the ball and all players,
+        the score and the play mode straight from the message text.
+        """
+
+        msg_time = int(msg[11:msg.index(" ", 11)])
+        state = FullState(msg_time)
+
+        pmode = self.PATTERN_FULLSTATE_PMODE.search(msg)
+        if pmode:
+            state.play_mode = pmode.group(1)
+
+        score = self.PATTERN_FULLSTATE_SCORE.search(msg)
+        if score:
+            state.score = (int(score.group(1)), int(score.group(2)))
+
+        for obj in self.PATTERN_FULLSTATE_OBJECT.finditer(msg):
+            name, side, uniform_number, goalie, values = obj.groups()
+            values = values.split()
+
+            if name == "b":
+                state.ball = [float(v) for v in values[:4]]
+                continue
+
+            # players carry x, y, vx, vy, body and neck, followed by optional
+            # pointing and stamina information we don't need here.
+            i = FullState.slot(side, int(uniform_number))
+            state.x[i] = float(values[0])
+            state.y[i] = float(values[1])
+            state.vx[i] = float(values[2])
+            state.vy[i] = float(values[3])
+            state.body[i] = float(values[4])
+            state.neck[i] = float(values[5])
+            state.goalie[i] = goalie is not None
+
+        return "fullstate", msg_time, state
+
+    def _parse_init(self, msg):
+        """
+        Deals with initialization messages sent by the server.
+        """
+
+        # the player's side, uniform number and the play mode as returned by
+        # the server directly after connecting.
+        side = msg[1]
+        uniform_number = msg[2]
+        play_mode = msg[3]
+
+        return msg[0], None, (side, uniform_number, play_mode)
+
+    def _parse_reconnect(self, msg):
+        """
+        The server's answer to a reconnect only carries side and play mode.
+        """
+
+        side = msg[1]
+        play_mode = msg[2]
+
+        return msg[0], None, (side, play_mode)
+
+    def _parse_error(self, msg):
+        """
+        Error messages carry a single reason, ex: 'no_more_team_or_player'.
+        """
+
+        return msg[0], None, msg[1] if len(msg) > 1 else None
     #
     # def _handle_change_player_type(self, msg):
     #     """
@@ -332,21 +413,6 @@ class MessageParser:
     #         else:
     #             raise AttributeError("Couldn't find a matching parameter in "
     #                                  "ServerParameters class: '%s'" % key)
-    #
-    # def _handle_init(self, msg):
-    #     """
-    #     Deals with initialization messages sent by the server.
-    #     """
-    #
-    #     # set the player's uniform number, side, and the play mode as returned
-    #     # by the server directly after connecting.
-    #     side = msg[1]
-    #     uniform_number = msg[2]
-    #     play_mode = msg[3]
-    #
-    #     self.wm.side = side
-    #     self.wm.uniform_number = uniform_number
-    #     self.wm.play_mode = play_mode
 
 
 if __name__ == "__main__":
@@ -4,30 +4,60 @@ from base.agent.perception.message_parser import MessageParser
 
 
 class Perception(Thread):
-    def __init__(self, agent):
+    def __init__(self, agent, use_fullstate=False, accuracy=None):
         Thread.__init__(self)
 
         self.agent = agent
 
+        # once a fullstate message arrived, see messages are not even parsed
+        # unless we want to compare them against the full state.
+        self.use_fullstate = use_fullstate
+        self.accuracy = accuracy
+        self.full_state = None
+
     def handle_msg(self, msg):
         # print('PERCEPTION:', msg)
+        skip_see = self.use_fullstate and self.full_state is not None
+
+        if skip_see and self.accuracy is None and msg.startswith('(see '):
+            self.agent.see_event.set()
+            return
+
         parser = MessageParser()
         msg_type, msg_time, data = parser.parse(msg)
 
         if msg_type == 'sense_body':
+            self.handle_sense_body(msg_time, data)
             self.agent.sense_body_event.set()
-            self.handle_see(msg_time, data)
         elif msg_type == 'see':
+            if self.accuracy is not None and self.full_state is not None \
+                    and self.full_state.time == msg_time:
+                self.accuracy.add(self.full_state, self.agent.side,
+                                  self.agent.uniform_number, data)
+            if not skip_see:
+                self.handle_see(msg_time, data)
             self.agent.see_event.set()
-            self.handle_sense_body(msg_time, data)
+        elif msg_type == 'fullstate':
+            self.full_state = data
+            self.handle_fullstate(msg_time, data)
 
     def handle_see(self, msg_time, objects):
         pass
 
+    def handle_fullstate(self, msg_time, full_state):
+        pass
+
     def handle_sense_body(self, msg_time, sense_body):
         pass
 
     def run(self):
         while True:
             msg, addr = self.agent.recvfrom()
+
+            # a late answer to an init the handshake had to repeat, the server
+            # registered a second player for us there.
+            if addr != self.agent.server_addr and msg.startswith('(init '):
+                self.agent.sendto('(bye)', addr)
+                continue
+
             self.handle_msg(msg)
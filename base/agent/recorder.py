@@ -0,0 +1,244 @@
+import mmap
+import os
+import struct
+from bisect import bisect_left
+from collections import namedtuple
+from queue import Queue, Empty
+from threading import Thread
+from time import time, monotonic
+
+
+SENT = 0
+RECEIVED = 1
+
+Record = namedtuple('Record', ['timestamp', 'cycle', 'direction', 'data'])
+
+
+class SessionRecorder(Thread):
+    """
+    Appends every datagram sent or received by a UDPClient to a compact
+    binary session file, together with a cycle->offset index.
+
+    The session file starts with MAGIC and is followed by records, each one a
+    RECORD header (timestamp, cycle, direction, payload length) and the raw
+    payload.  The index file (path + '.idx') is a flat array of INDEX entries
+    mapping every cycle to the offset of its first record.
+    """
+
+    MAGIC = b'RCSR\x01\x00\x00\x00'
+    RECORD = struct.Struct('<dIBI')
+    INDEX = struct.Struct('<IQ')
+
+    # server messages that carry the simulation time as their first argument
+    TIMED_MESSAGES = (b'see', b'sense_body', b'hear', b'fullstate', b'think')
+
+    BUFFER_SIZE = 1 << 16
+    FLUSH_INTERVAL = 1.0
+
+    def __init__(self, path):
+        Thread.__init__(self, daemon=True)
+
+        self.path = path
+        self.queue = Queue()
+
+        self.cycle = 0
+        self.last_indexed = None
+        self.closed = False
+
+    def record(self, direction, data):
+        """
+        Called from the client's hot path, so it only timestamps the datagram
+        and hands it over to the writer thread.
+        """
+
+        # nobody would ever take it out of the queue again
+        if self.closed:
+            return
+
+        self.queue.put((time(), direction, data))
+
+    def close(self):
+        """
+        Flushes everything recorded so far and stops the writer thread.
+        """
+
+        self.closed = True
+        if not self.is_alive():
+            return
+
+        self.queue.put(None)
+        self.join()
+
+    def run(self):
+        with open(self.path, 'wb', buffering=self.BUFFER_SIZE) as log, \
+                open(self.path + '.idx', 'wb', buffering=self.BUFFER_SIZE) as index:
+            log.write(self.MAGIC)
+            last_flush = monotonic()
+
+            while True:
+                # make what we have durable at least every FLUSH_INTERVAL, no
+                # matter how busy the match is, so a crash loses little.
+                if monotonic() - last_flush >= self.FLUSH_INTERVAL:
+                    # the log first, so the index never points past its end
+                    log.flush()
+                    index.flush()
+                    last_flush = monotonic()
+
+                try:
+                    item = self.queue.get(timeout=self.FLUSH_INTERVAL)
+                except Empty:
+                    continue
+
+                if item is None:
+                    break
+
+                timestamp, direction, data = item
+
+                # the cycle is taken from the server's messages, every
+                # datagram we send is tagged with the last cycle we received.
+                if direction == RECEIVED:
+                    self._update_cycle(data)
+
+                if self.last_indexed is None or self.cycle > self.last_indexed:
+                    index.write(self.INDEX.pack(self.cycle, log.tell()))
+                    self.last_indexed = self.cycle
+
+                log.write(self.RECORD.pack(timestamp, self.cycle, direction, len(data)))
+                log.write(data)
+
+    def _update_cycle(self, data):
+        # timed messages look like b'(see 568 ...', others such as
+        # b'(change_player_type 2 ...' carry numbers that are no cycle.
+        tokens = data[1:24].split(b' ', 2)
+        if len(tokens) >= 2 and tokens[0] in self.TIMED_MESSAGES:
+            cycle = tokens[1].rstrip(b')')
+            if cycle.isdigit() and int(cycle) > self.cycle:
+                self.cycle = int(cycle)
+
+
+class SessionReader:
+    """
+    Random access to a session written by SessionRecorder.  The session file
+    is memory-mapped, so jumping to a cycle costs a lookup in the index and
+    only the records that are actually read are paged in.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+
+        # a live session may not have been flushed yet, it reads as empty.
+        # mmap can't map an empty file, so don't map a short one at all.
+        magic = SessionRecorder.MAGIC
+        if os.fstat(self._file.fileno()).st_size < len(magic):
+            self._mmap = b''
+            if not magic.startswith(self._file.read()):
+                self.close()
+                raise ValueError("Not a session file: '%s'" % path)
+        else:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._mmap[:len(magic)] != magic:
+                self.close()
+                raise ValueError("Not a session file: '%s'" % path)
+
+        self.cycles = []
+        self.offsets = []
+
+        end = len(self._mmap)
+        try:
+            with open(path + '.idx', 'rb') as index:
+                data = index.read()
+        except FileNotFoundError:
+            # the recorder creates both files at once, this one may lag behind
+            data = b''
+
+        # a recorder that was killed may leave a truncated entry behind, or
+        # entries pointing past what made it into the log.
+        data = data[:len(data) - len(data) % SessionRecorder.INDEX.size]
+        for cycle, offset in SessionRecorder.INDEX.iter_unpack(data):
+            if offset >= end:
+                break
+            self.cycles.append(cycle)
+            self.offsets.append(offset)
+
+        # the log may also hold cycles the index was not flushed for yet
+        start = self.offsets[-1] if self.offsets else len(SessionRecorder.MAGIC)
+        for offset, cycle in self._scan(start):
+            if not self.cycles or cycle > self.cycles[-1]:
+                self.cycles.append(cycle)
+                self.offsets.append(offset)
+
+    def close(self):
+        if isinstance(self._mmap, mmap.mmap):
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __iter__(self):
+        return self._records(len(SessionRecorder.MAGIC))
+
+    def read_cycle(self, cycle):
+        """
+        Returns all records tagged with the given cycle.
+        """
+
+        return list(self.read_range(cycle, cycle))
+
+    def read_range(self, first, last):
+        """
+        Yields the records of all cycles from first to last, inclusive.
+        """
+
+        i = bisect_left(self.cycles, first)
+        if i == len(self.cycles):
+            return
+
+        for rec in self._records(self.offsets[i]):
+            if rec.cycle > last:
+                break
+            yield rec
+
+    def _scan(self, offset):
+        # yields (offset, cycle) of every record, without reading payloads
+        header = SessionRecorder.RECORD
+        buf = self._mmap
+        end = len(buf)
+
+        # a recorder that was killed may leave a truncated record at the end
+        while offset + header.size <= end:
+            timestamp, cycle, direction, length = header.unpack_from(buf, offset)
+            if offset + header.size + length > end:
+                break
+
+            yield offset, cycle
+            offset += header.size + length
+
+    def _records(self, offset):
+        header = SessionRecorder.RECORD
+        buf = self._mmap
+
+        for offset, cycle in self._scan(offset):
+            timestamp, cycle, direction, length = header.unpack_from(buf, offset)
+            offset += header.size
+
+            yield Record(timestamp, cycle, direction, buf[offset:offset + length])
+
+
+if __name__ == '__main__':
+    import sys
+
+    with SessionReader(sys.argv[1]) as reader:
+        if len(sys.argv) >= 3:
+            first = int(sys.argv[2])
+            last = int(sys.argv[3]) if len(sys.argv) >= 4 else first
+            records = reader.read_range(first, last)
+        else:
+            records = reader
+
+        for rec in records:
+            arrow = '->' if rec.direction == SENT else '<-'
+            print(rec.cycle, '%.3f' % rec.timestamp, arrow, str(rec.data, 'utf-8'))
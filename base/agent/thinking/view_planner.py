@@ -0,0 +1,138 @@
+from base.agent.execution.commands import Command
+from base.soccer.geometry import normalize_angle
+from base.soccer.world_model import WorldModel
+
+
+class ViewPlanner:
+    """
+    Chooses change_view and turn_neck each cycle so that the agent gets the
+    most useful perception per server cycle.
+
+    A narrow view sends see messages twice as often as a normal one but covers
+    half of the angle, a wide one covers twice the angle at half the rate.
+    Every candidate (width, neck angle) is scored by the value of the objects
+    it would refresh minus a fixed cost for processing a see message, divided
+    by the number of cycles between two see messages.  Objects whose staleness
+    is bounded restrict the candidates to those that keep them in view.
+    """
+
+    # full view cone in degrees and cycles between see messages, for high
+    # quality and the default server parameters.
+    VIEW_WIDTHS = {
+        'narrow': (45, 0.75),
+        'normal': (90, 1.5),
+        'wide': (180, 3.0),
+    }
+
+    NECK_ANGLES = (-90, -60, -30, 0, 30, 60, 90)
+
+    def __init__(self, wm: WorldModel, key_opponents=(),
+                 ball_weight=5.0, key_weight=2.0, player_weight=1.0,
+                 ball_limit=3, key_limit=10, staleness_cap=20, see_cost=0.5):
+        self.wm = wm
+
+        self.key_opponents = set(key_opponents)
+        self.ball_weight = ball_weight
+        self.key_weight = key_weight
+        self.player_weight = player_weight
+
+        # maximum staleness we tolerate for the ball and key opponents
+        self.ball_limit = ball_limit
+        self.key_limit = key_limit
+
+        self.staleness_cap = staleness_cap
+        self.see_cost = see_cost
+
+    def plan(self):
+        """
+        Returns the commands for this cycle, possibly none.
+        """
+
+        width, neck = self.choose()
+        commands = []
+
+        if width != self.wm.view_width or self.wm.view_quality != 'high':
+            commands.append(Command('change_view', width, 'high'))
+
+        # turn_neck is relative to the current neck angle
+        turn = neck - self.wm.neck_direction
+        if turn != 0:
+            commands.append(Command('turn_neck', turn))
+
+        return commands
+
+    def choose(self):
+        """
+        Returns the best (view width, neck angle) for the current world model.
+        """
+
+        tracked = self._tracked()
+
+        candidates = [(width, angle, period, neck)
+                      for width, (angle, period) in self.VIEW_WIDTHS.items()
+                      for neck in self.NECK_ANGLES]
+
+        bounded = [c for c in candidates if self._keeps_bounded(tracked, *c[1:])]
+
+        # if nothing keeps every bounded object in view, fall back to the
+        # plain information gain.
+        return self._best(tracked, bounded or candidates)
+
+    def _best(self, tracked, candidates):
+        # on equal scores, ex: when nothing has been seen yet, keep the neck
+        # where it is rather than turning it for nothing.
+        def key(candidate):
+            width, angle, period, neck = candidate
+            score = round(self._score(tracked, angle, period, neck), 9)
+            return score, -abs(neck - self.wm.neck_direction), width == self.wm.view_width
+
+        width, angle, period, neck = max(candidates, key=key)
+        return width, neck
+
+    def _tracked(self):
+        # (weight, staleness, body-relative direction, staleness limit)
+        tracked = []
+
+        # perception keeps adding objects from its own thread, work on a copy
+        for key, (cycle, direction) in list(self.wm.last_seen.items()):
+            if key == WorldModel.BALL:
+                weight, limit = self.ball_weight, self.ball_limit
+            elif key[1:] in self.key_opponents:
+                weight, limit = self.key_weight, self.key_limit
+            else:
+                weight, limit = self.player_weight, None
+
+            staleness = self.wm.staleness(key)
+            if staleness is None:
+                staleness = self.staleness_cap
+
+            tracked.append((weight, staleness, self.wm.body_direction(direction), limit))
+
+        # the ball is worth looking for even if we have never seen it
+        if WorldModel.BALL not in self.wm.last_seen:
+            tracked.append((self.ball_weight, None, None, None))
+
+        return tracked
+
+    def _keeps_bounded(self, tracked, angle, period, neck):
+        for weight, staleness, direction, limit in tracked:
+            if limit is None or direction is None:
+                continue
+            if staleness + period >= limit and not self._in_view(direction, angle, neck):
+                return False
+        return True
+
+    def _score(self, tracked, angle, period, neck):
+        gain = 0.0
+        for weight, staleness, direction, limit in tracked:
+            if direction is None:
+                # never seen, any view may find it
+                gain += weight * angle / 360
+            elif self._in_view(direction, angle, neck):
+                gain += weight * min(staleness + period, self.staleness_cap) / self.staleness_cap
+
+        return (gain - self.see_cost) / period
+
+    @staticmethod
+    def _in_view(direction, angle, neck):
+        return abs(normalize_angle(direction - neck)) <= angle / 2
@@ -1,13 +1,26 @@
 import socket
 
+from base.agent.recorder import SENT, RECEIVED
+
 
 class UDPClient:
     def __init__(self):
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
 
+        # optional SessionRecorder that gets a copy of every datagram
+        self.recorder = None
+
     def sendto(self, message, server_addr):
-        self.sock.sendto(bytes(message, "utf-8"), server_addr)
+        data = bytes(message, "utf-8")
+        self.sock.sendto(data, server_addr)
+
+        if self.recorder is not None:
+            self.recorder.record(SENT, data)
 
     def recvfrom(self):
-        data, addr = self.sock.recvfrom(1024)
+        data, addr = self.sock.recvfrom(8192)
+
+        if self.recorder is not None:
+            self.recorder.record(RECEIVED, data)
+
         return str(data, "utf-8"), addr
@@ -0,0 +1,30 @@
+class FullState:
+    """
+    Exact state of the whole field as sent by the server in fullstate mode.
+
+    Players are stored column-wise in flat lists of 22 slots, left team first,
+    so the world model can keep references to them instead of copying
+    objects around.  Slots of players that are not on the field stay None.
+    """
+
+    PLAYERS = 22
+
+    def __init__(self, time):
+        self.time = time
+        self.play_mode = None
+        self.score = (0, 0)
+
+        # x, y, vx, vy
+        self.ball = None
+
+        self.x = [None] * self.PLAYERS
+        self.y = [None] * self.PLAYERS
+        self.vx = [None] * self.PLAYERS
+        self.vy = [None] * self.PLAYERS
+        self.body = [None] * self.PLAYERS
+        self.neck = [None] * self.PLAYERS
+        self.goalie = [False] * self.PLAYERS
+
+    @staticmethod
+    def slot(side, uniform_number):
+        return (0 if side == 'l' else 11) + uniform_number - 1
@@ -0,0 +1,6 @@
+def normalize_angle(angle):
+    """
+    Maps an angle in degrees to [-180, 180).
+    """
+
+    return (angle + 180) % 360 - 180
@@ -1,5 +1,6 @@
 class SenseBody:
-    def __init__(self, view_quality, view_width, stamina, effort, speed_amount, speed_direction, neck_direction):
+    def __init__(self, view_quality, view_width, stamina, effort, speed_amount, speed_direction, neck_direction,
+                 turn_count=None):
         self.view_quality = view_quality
         self.view_width = view_width
         self.stamina = stamina
@@ -7,3 +8,4 @@ class SenseBody:
         self.speed_amount = speed_amount
         self.speed_direction = speed_direction
         self.neck_direction = neck_direction
+        self.turn_count = turn_count
@@ -0,0 +1,151 @@
+from math import atan2, degrees
+
+from base.soccer.full_state import FullState
+from base.soccer.geometry import normalize_angle
+
+
+class WorldModel:
+    """
+    What the agent currently knows about the world.  Keeps the cycle and the
+    direction every tracked object was last seen at, so that the agent can
+    reason about how stale its information is.
+
+    Directions are stored relative to the body angle the agent had when it
+    started, which is kept up to date from the turns it issued and the turn
+    counter in sense_body.  That way they stay valid while the body turns.
+    """
+
+    BALL = 'b'
+
+    # default player type, used to predict how far a turn actually turns
+    INERTIA_MOMENT = 5.0
+
+    def __init__(self):
+        self.time = None
+
+        # our team name, the opponents' one is learnt from see
+        self.team = None
+        self.opponent_team = None
+
+        # the latest view mode and neck angle from sense_body
+        self.view_quality = None
+        self.view_width = None
+        self.neck_direction = 0
+        self.speed = 0
+
+        # total body turn since the start, and the turn issued this cycle
+        # that the server has not confirmed yet.
+        self.body_angle = 0
+        self.pending_turn = 0
+        self.turn_count = None
+
+        # object key -> (cycle, direction relative to the initial body angle)
+        self.last_seen = {}
+
+        # exact state, only available when the server runs in fullstate mode
+        self.full_state = None
+        self.play_mode = None
+        self.score = None
+        self.ball = None
+
+        # own x, y, body and neck direction
+        self.pose = None
+
+    @staticmethod
+    def player_key(team, uniform_number):
+        return 'p', team, uniform_number
+
+    def update_sense_body(self, msg_time, sense_body):
+        self.time = msg_time
+
+        self.view_quality = sense_body.view_quality
+        self.view_width = sense_body.view_width
+        if sense_body.neck_direction is not None:
+            self.neck_direction = sense_body.neck_direction
+        if sense_body.speed_amount is not None:
+            self.speed = sense_body.speed_amount
+
+        # the server counts executed turns, only apply ours if it happened
+        if sense_body.turn_count is not None:
+            if self.turn_count is not None and sense_body.turn_count > self.turn_count:
+                self.body_angle += self.pending_turn
+            self.turn_count = sense_body.turn_count
+        self.pending_turn = 0
+
+    def turn_body(self, moment):
+        """
+        Called when a turn command is issued, the turn is applied once the
+        next sense_body confirms it.
+        """
+
+        self.pending_turn = moment / (1 + self.INERTIA_MOMENT * self.speed)
+
+    def body_direction(self, direction):
+        """
+        Converts a stored direction into one relative to the body as it will
+        be after this cycle's turn.
+        """
+
+        return normalize_angle(direction - self.body_angle - self.pending_turn)
+
+    def update_see(self, msg_time, objects):
+        ball, players, flags, lines, goals = objects
+
+        # directions in see are relative to the head, store them in a frame
+        # that neither neck nor body turns change.
+        offset = self.neck_direction + self.body_angle
+
+        if ball is not None and ball.direction is not None:
+            self.last_seen[self.BALL] = (msg_time, ball.direction + offset)
+
+        for player in players:
+            # players too far away to be identified can't be tracked
+            if player.uniform_number is None or player.direction is None:
+                continue
+
+            if player.team is not None and player.team != self.team:
+                self.opponent_team = player.team
+
+            key = self.player_key(player.team, player.uniform_number)
+            self.last_seen[key] = (msg_time, player.direction + offset)
+
+    def update_fullstate(self, msg_time, full_state: FullState, side, uniform_number):
+        self.time = msg_time
+
+        # keep the state's arrays as they are, there is nothing to estimate
+        self.full_state = full_state
+        self.play_mode = full_state.play_mode
+        self.score = full_state.score
+        self.ball = full_state.ball
+
+        me = FullState.slot(side, uniform_number)
+        if full_state.x[me] is None:
+            return
+
+        x, y, body = full_state.x[me], full_state.y[me], full_state.body[me]
+        self.pose = (x, y, body, full_state.neck[me])
+
+        # everything is seen every cycle, store the exact directions in the
+        # same frame update_see uses so last_seen stays current without see.
+        def direction(obj_x, obj_y):
+            return degrees(atan2(obj_y - y, obj_x - x)) - body + self.body_angle
+
+        if full_state.ball is not None:
+            self.last_seen[self.BALL] = (msg_time, direction(*full_state.ball[:2]))
+
+        for i in range(FullState.PLAYERS):
+            if i == me or full_state.x[i] is None:
+                continue
+
+            team = self.team if (i < 11) == (side == 'l') else self.opponent_team
+            key = self.player_key(team, i % 11 + 1)
+            self.last_seen[key] = (msg_time, direction(full_state.x[i], full_state.y[i]))
+
+    def staleness(self, key):
+        """
+        Number of cycles since the object was last seen, None if never.
+        """
+
+        if key not in self.last_seen or self.time is None:
+            return None
+        return self.time - self.last_seen[key][0]
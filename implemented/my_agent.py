@@ -3,10 +3,12 @@ from base.agent.execution.commands import Command
 from base.agent.execution.execution import Execution
 from base.agent.perception.perception import Perception
 from base.agent.thinking.thinking import Thinking
+from base.agent.thinking.view_planner import ViewPlanner
+from base.soccer.world_model import WorldModel
 
 
-class MyWorldModel:
-    time = None
+class MyWorldModel(WorldModel):
+    pass
 
 
 class MyThinking(Thinking):
@@ -14,41 +16,52 @@ class MyThinking(Thinking):
         Thinking.__init__(self, agent)
 
         self.wm = wm
+        self.view_planner = ViewPlanner(wm)
 
         self.clockwise = True
         self.moved = False
 
     def think(self):
+        # act every cycle, with wide view a see only arrives every third one
         self.agent.sense_body_event.clear()
         self.agent.sense_body_event.wait()
 
-        self.agent.see_event.clear()
-        self.agent.see_event.wait()
-
         if self.wm.time % 10 == 1:
             self.clockwise = not self.clockwise
 
         if not self.moved:
             self.agent.execute_command(Command('move', -5, 0))
-            self.agent.execute_command(Command('change_view', 'narrow', 'high'))
             self.moved = True
         elif self.clockwise:
             self.agent.execute_command(Command('turn', 45))
+            self.wm.turn_body(45)
         else:
             self.agent.execute_command(Command('turn', -45))
+            self.wm.turn_body(-45)
+
+        for command in self.view_planner.plan():
+            self.agent.execute_command(command)
 
 
 class MyPerception(Perception):
-    def __init__(self, agent, wm):
-        Perception.__init__(self, agent)
+    def __init__(self, agent, wm, use_fullstate=False, accuracy=None):
+        Perception.__init__(self, agent, use_fullstate, accuracy)
         self.wm = wm
+        self.wm.team = agent.team
 
     def handle_sense_body(self, msg_time, sense_body):
-        self.wm.time = msg_time
+        self.wm.update_sense_body(msg_time, sense_body)
 
+    def handle_see(self, msg_time, objects):
+        self.wm.update_see(msg_time, objects)
 
-if __name__ == '__main__':
-    agent = Agent('LETIgers')
+    def handle_fullstate(self, msg_time, full_state):
+        self.wm.update_fullstate(msg_time, full_state,
+                                 self.agent.side, self.agent.uniform_number)
+
+
+def create_agent(team, goalie=False):
+    agent = Agent(team, goalie)
     agent.execution = Execution(agent)
 
     wm = MyWorldModel()
@@ -56,4 +69,8 @@ if __name__ == '__main__':
     agent.perception = MyPerception(agent, wm)
     agent.thinking = MyThinking(agent, wm)
 
-    agent.run()
+    return agent
+
+
+if __name__ == '__main__':
+    create_agent('LETIgers').run()
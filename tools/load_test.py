@@ -0,0 +1,237 @@
+"""
+Measures how the agent runtime scales when many agents share one host.
+
+For every combination of agent count and cycle length, a StandInServer is
+started, the agents are spawned as separate processes (one per player, like
+in a real match) and driven for a number of cycles.  Per-agent CPU time,
+context switches and RSS are read from /proc, so this only runs on Linux.
+
+Execution waits a fixed delay after every sense_body before it sends its
+commands, tuned for the server's 100 ms cycle.  The agents' delay is scaled
+with the simulated cycle length, so it stays the same share of the cycle and
+shorter cycles measure the runtime instead of that delay.
+
+    python -m tools.load_test --agent implemented.my_agent:create_agent \\
+        --agents 1,2,4,11,22 --steps 100,50,25 --json results.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from importlib import import_module
+from time import sleep
+
+from base.agent.execution.execution import Execution
+from tools.stand_in_server import StandInServer
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVER_STEP = 0.1
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+
+
+class ProcessStats:
+    """
+    Snapshot of a process' resource usage, summed over all its threads.
+    """
+
+    def __init__(self, pid):
+        with open(f'/proc/{pid}/stat') as f:
+            # the command name may contain spaces, fields start after it
+            fields = f.read().rsplit(')', 1)[1].split()
+        self.cpu = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+
+        with open(f'/proc/{pid}/statm') as f:
+            self.rss = int(f.read().split()[1]) * PAGE_SIZE
+
+        self.voluntary = 0
+        self.involuntary = 0
+        for tid in os.listdir(f'/proc/{pid}/task'):
+            try:
+                with open(f'/proc/{pid}/task/{tid}/status') as f:
+                    for line in f:
+                        if line.startswith('voluntary_ctxt_switches'):
+                            self.voluntary += int(line.split()[1])
+                        elif line.startswith('nonvoluntary_ctxt_switches'):
+                            self.involuntary += int(line.split()[1])
+            except FileNotFoundError:
+                # the thread exited in the meantime
+                pass
+
+
+def run_agent(spec, team, host, port, step):
+    """
+    Entry point of the agent processes.  spec is 'module:factory', the
+    factory gets the team name and returns an agent that is not running yet.
+    """
+
+    module, factory = spec.split(':')
+    agent = getattr(import_module(module), factory)(team)
+    agent.server_addr = (host, port)
+
+    if isinstance(agent.execution, Execution):
+        agent.execution.send_delay = agent.execution.SEND_DELAY * step / SERVER_STEP
+
+    agent.run()
+
+
+def measure(spec, agents, step, cycles, warmup):
+    server = StandInServer()
+    server.start()
+    host, port = server.addr
+
+    processes = []
+    try:
+        for i in range(agents):
+            team = 'LoadA' if i < 11 else 'LoadB'
+            processes.append(subprocess.Popen(
+                [sys.executable, '-m', 'tools.load_test', '--child', spec,
+                 '--team', team, '--port', str(port), '--step', str(step)], cwd=ROOT))
+
+        if not server.wait_for_players(agents, timeout=10 + agents):
+            raise RuntimeError(f'only {len(server.players)} of {agents} agents connected')
+
+        server.run_cycles(warmup, step)
+        server.reset_on_time()
+
+        before = [ProcessStats(p.pid) for p in processes]
+        late_cycles = server.run_cycles(cycles, step)
+        after = [ProcessStats(p.pid) for p in processes]
+
+        # commands of the last cycle may still be on their way
+        sleep(step)
+    finally:
+        for p in processes:
+            p.kill()
+        for p in processes:
+            p.wait()
+        server.close()
+
+    on_time = [len(server.on_time[addr]) / cycles for addr in server.players]
+
+    return {
+        'agents': agents,
+        'step_ms': step * 1000,
+        'late_cycles': late_cycles,
+        'cpu_ms_per_cycle': [(a.cpu - b.cpu) * 1000 / cycles for b, a in zip(before, after)],
+        'voluntary_per_cycle': [(a.voluntary - b.voluntary) / cycles for b, a in zip(before, after)],
+        'involuntary_per_cycle': [(a.involuntary - b.involuntary) / cycles for b, a in zip(before, after)],
+        'rss_mb': [a.rss / 2 ** 20 for a in after],
+        'on_time': on_time,
+    }
+
+
+def mean(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+def report(results, threshold):
+    lines = ['%6s %8s %10s %10s %10s %8s %8s %6s' % (
+        'agents', 'step ms', 'cpu ms/cy', 'vol cs/cy', 'inv cs/cy', 'rss MB', 'on time', 'late')]
+
+    for r in results:
+        lines.append('%6d %8.0f %10.2f %10.2f %10.2f %8.1f %7.1f%% %6d' % (
+            r['agents'], r['step_ms'],
+            mean(r['cpu_ms_per_cycle']),
+            mean(r['voluntary_per_cycle']),
+            mean(r['involuntary_per_cycle']),
+            mean(r['rss_mb']),
+            min(r['on_time']) * 100,
+            r['late_cycles']))
+
+    # the largest number of agents for which every agent still delivered its
+    # commands in time, per cycle length.
+    cores = os.cpu_count()
+    lines.append('')
+    for step in sorted({r['step_ms'] for r in results}, reverse=True):
+        fitting = [r['agents'] for r in results
+                   if r['step_ms'] == step and min(r['on_time']) >= threshold]
+        if fitting:
+            lines.append('step %.0f ms: %d agents on %d cores (%.1f per core)' % (
+                step, max(fitting), cores, max(fitting) / cores))
+        else:
+            lines.append('step %.0f ms: no agent count kept %.0f%% on time' % (step, threshold * 100))
+
+    return '\n'.join(lines)
+
+
+def compare(results, baseline, cpu_tolerance=0.2, on_time_tolerance=0.01):
+    """
+    Returns the regressions of results against a previous run.
+    """
+
+    previous = {(r['agents'], r['step_ms']): r for r in baseline}
+    regressions = []
+
+    for r in results:
+        old = previous.get((r['agents'], r['step_ms']))
+        if old is None:
+            continue
+
+        cpu, old_cpu = mean(r['cpu_ms_per_cycle']), mean(old['cpu_ms_per_cycle'])
+        if cpu > old_cpu * (1 + cpu_tolerance):
+            regressions.append('%d agents, %.0f ms: cpu %.2f -> %.2f ms/cycle' % (
+                r['agents'], r['step_ms'], old_cpu, cpu))
+
+        on_time, old_on_time = min(r['on_time']), min(old['on_time'])
+        if on_time < old_on_time - on_time_tolerance:
+            regressions.append('%d agents, %.0f ms: on time %.1f%% -> %.1f%%' % (
+                r['agents'], r['step_ms'], old_on_time * 100, on_time * 100))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--agent', default='implemented.my_agent:create_agent',
+                        help="agent factory as 'module:function'")
+    parser.add_argument('--agents', default='1,2,4,8,11,22',
+                        help='comma separated agent counts')
+    parser.add_argument('--steps', default='100,50,25',
+                        help='comma separated cycle lengths in ms')
+    parser.add_argument('--cycles', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--threshold', type=float, default=0.99,
+                        help='fraction of cycles every agent has to be on time in')
+    parser.add_argument('--json', help='write the raw results to this file')
+    parser.add_argument('--baseline', help='compare against the results of a previous run')
+
+    # used for the agent processes spawned by the harness itself
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--team', help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--step', type=float, help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.child:
+        run_agent(args.child, args.team, 'localhost', args.port, args.step)
+        return
+
+    results = []
+    for step in [int(s) / 1000 for s in args.steps.split(',')]:
+        for agents in [int(n) for n in args.agents.split(',')]:
+            results.append(measure(args.agent, agents, step, args.cycles, args.warmup))
+            print('measured %d agents at %.0f ms' % (agents, step * 1000), file=sys.stderr)
+
+    print(report(results, args.threshold))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f))
+
+        if regressions:
+            print('\nregressions:')
+            print('\n'.join(regressions))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
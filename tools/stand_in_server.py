@@ -0,0 +1,131 @@
+import re
+import socket
+from threading import Thread, Lock
+from time import perf_counter, sleep
+
+
+class StandInServer(Thread):
+    """
+    A minimal replacement for rcssserver, good enough to drive agents in load
+    tests.  It answers (init ...) requests, then sends sense_body and see to
+    every player each cycle and records in which cycle the players' commands
+    arrive.
+
+    Only datagrams carrying at least one command count, an empty one just
+    means the execution thread woke up with nothing to send.  Datagrams
+    don't say which cycle they answer, so a command arriving during a cycle
+    credits that cycle.  An agent that always answers one
+    cycle late therefore still looks on time once per cycle it catches.
+    """
+
+    SENSE_BODY = '(sense_body %d (view_mode high normal) (stamina 8000 1) (speed 0 0) (head_angle 0))'
+    SEE = ('(see %d ((f l t) 30 -38 -0 0) ((f t l 20) 19.1 43 0 0) ((f t l 30) 18.7 12 -0 0) '
+           '((f t l 40) 23.3 -12 -0 0) ((f t l 50) 30.6 -27) ((b) 1.2 5 -0.024 2.7) '
+           '((p "team_jason" 2) 0.7 -34 -0 0 42 42) ((l t) 14.7 -64))')
+
+    PATTERN_COMMAND = re.compile(rb"\s*\([a-z_]+[ )]")
+
+    def __init__(self, host='localhost', port=0):
+        Thread.__init__(self, daemon=True)
+
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.addr = self.sock.getsockname()
+
+        self.lock = Lock()
+        self.cycle = None
+
+        # cycles keep counting across calls of run_cycles
+        self.last_cycle = 0
+
+        # player address -> (side, uniform number)
+        self.players = {}
+        self.teams = {}
+
+        # player address -> set of cycles in which a command arrived in time
+        self.on_time = {}
+
+    def run(self):
+        while True:
+            try:
+                data, addr = self.sock.recvfrom(8192)
+            except OSError:
+                # the socket was closed
+                return
+
+            if data.startswith(b'(init '):
+                self._handle_init(data, addr)
+                continue
+
+            if not self.PATTERN_COMMAND.match(data):
+                continue
+
+            with self.lock:
+                if self.cycle is not None and addr in self.on_time:
+                    self.on_time[addr].add(self.cycle)
+
+    def close(self):
+        self.sock.close()
+
+    def wait_for_players(self, count, timeout):
+        deadline = perf_counter() + timeout
+        while len(self.players) < count:
+            if perf_counter() > deadline:
+                return False
+            sleep(0.01)
+        return True
+
+    def reset_on_time(self):
+        with self.lock:
+            for cycles in self.on_time.values():
+                cycles.clear()
+
+    def run_cycles(self, cycles, step):
+        """
+        Sends the sensor messages of the given number of cycles, one every
+        step seconds.  Returns the number of cycles that started late.
+        """
+
+        late = 0
+        first = self.last_cycle + 1
+        start = perf_counter() - (first - 1) * step
+
+        for t in range(first, first + cycles):
+            # a command is on time if it arrives before the next cycle starts
+            with self.lock:
+                self.cycle = t
+
+            sense_body = bytes(self.SENSE_BODY % t, 'utf-8')
+            see = bytes(self.SEE % t, 'utf-8')
+            for addr in list(self.players):
+                self.sock.sendto(sense_body, addr)
+                self.sock.sendto(see, addr)
+
+            delay = start + t * step - perf_counter()
+            if delay > 0:
+                sleep(delay)
+            else:
+                late += 1
+
+        with self.lock:
+            self.cycle = None
+        self.last_cycle = first + cycles - 1
+
+        return late
+
+    def _handle_init(self, data, addr):
+        team = str(data, 'utf-8').split()[1].rstrip(')')
+
+        with self.lock:
+            if addr not in self.players:
+                if team not in self.teams:
+                    self.teams[team] = ['l', 'r'][len(self.teams) % 2], 0
+                side, count = self.teams[team]
+                self.teams[team] = side, count + 1
+
+                self.players[addr] = (side, count + 1)
+                self.on_time[addr] = set()
+
+            side, uniform_number = self.players[addr]
+
+        self.sock.sendto(bytes(f'(init {side} {uniform_number} before_kick_off)', 'utf-8'), addr)